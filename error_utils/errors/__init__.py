@@ -1,2 +1,7 @@
 from .exceptions import BadRequest, BaseError, AccessDeniedError, AuthorizationError, InternalError, NotFoundError
 from .handlers import AbstractErrorHandler, BaseErrorHandler, ExceptionsProcessor, Error
+from .compression import ErrorBodyEncoder
+from .messages import MessageCatalog
+from .spool import ErrorSpool, SpoolReader, read_spool
+from .streaming import StreamFormat, get_stream_error, render_error_frame
+from .tracebacks import TracebackPolicy
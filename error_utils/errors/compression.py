@@ -0,0 +1,149 @@
+import gzip
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+from error_utils.errors.headers import parse_quality_values
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+@lru_cache(maxsize=512)
+def get_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Choose the most preferred content encoding supported: brotli if it is installed, or gzip."""
+    qualities = parse_quality_values(accept_encoding)
+    supported = ("br", "gzip") if brotli is not None else ("gzip",)
+    refused = {name for name, quality in qualities if quality <= 0}
+    for name, quality in qualities:
+        if quality <= 0:
+            break
+        if name in supported:
+            return name
+        if name == "*":
+            return next((encoding for encoding in supported if encoding not in refused), None)
+    return None
+
+
+def get_encoding_headers(encoding: Optional[str]) -> Dict[str, str]:
+    if encoding is None:
+        return {"Vary": "Accept-Encoding"}
+    return {"Content-Encoding": encoding, "Vary": "Accept-Encoding"}
+
+
+class ErrorBodyEncoder:
+    """
+    Serializes error bodies to JSON, compressing the ones of at least ``min_size`` bytes.
+
+    Bodies larger than ``max_size`` bytes are truncated: the longest fitting prefix of a list detail is kept,
+    other details are dropped, the message is cut, and ``"truncated": true`` is added to the body.
+    If it still doesn't fit, e.g. due to other large fields, only the error type is kept.
+    Compressed bodies are cached by digest of the body, so repeated errors are compressed once.
+    The cache keeps at most ``cache_size`` bodies of ``cache_max_bytes`` total compressed size.
+    """
+
+    def __init__(
+        self,
+        min_size: int = 1024,
+        max_size: int = 1024 * 1024,
+        cache_size: int = 128,
+        cache_max_bytes: int = 1024 * 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 5,
+    ):
+        self.min_size = min_size
+        self.max_size = max_size
+        self.cache_size = cache_size
+        self.cache_max_bytes = cache_max_bytes
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self._cache: "OrderedDict[Tuple[str, bytes], bytes]" = OrderedDict()
+        self._cache_bytes = 0
+        self._lock = threading.Lock()
+
+    def encode(self, data: dict, accept_encoding: str = None) -> Tuple[bytes, Optional[str]]:
+        """
+        :param data: Error body
+        :param accept_encoding: Value of ``Accept-Encoding`` header
+        :return: Body and its content encoding, ``None`` if it is not compressed
+        """
+        body = self.dumps(data)
+        if len(body) > self.max_size:
+            body = self.truncate(data)
+
+        encoding = get_encoding(accept_encoding) if len(body) >= self.min_size else None
+        if encoding is None:
+            return body, None
+        return self.compress(body, encoding), encoding
+
+    @staticmethod
+    def dumps(data: dict) -> bytes:
+        return json.dumps(data, ensure_ascii=False, separators=(",", ":"), default=str).encode()
+
+    def truncate(self, data: dict) -> bytes:
+        data = dict(data, truncated=True)
+        detail = data.get("detail")
+        data["detail"] = None
+        if isinstance(detail, list):
+            low, high = 0, len(detail)
+            while low < high:
+                middle = (low + high + 1) // 2
+                data["detail"] = detail[:middle]
+                if len(self.dumps(data)) <= self.max_size:
+                    low = middle
+                else:
+                    high = middle - 1
+            data["detail"] = detail[:low]
+
+        body = self.dumps(data)
+        message = data.get("message")
+        if len(body) > self.max_size and isinstance(message, str):
+            encoded_message = message.encode()
+            length = max(len(encoded_message) - (len(body) - self.max_size), 0)
+            data["message"] = encoded_message[:length].decode(errors="ignore")
+            body = self.dumps(data)
+        if len(body) > self.max_size:
+            body = self.truncate_minimal(data)
+        return body
+
+    def truncate_minimal(self, data: dict) -> bytes:
+        """The error type alone, cut to fit ``max_size`` if other fields are too large."""
+        error = str(data.get("error"))
+        data = dict(error=error, truncated=True)
+        body = self.dumps(data)
+        if len(body) > self.max_size:
+            encoded_error = error.encode()
+            length = max(len(encoded_error) - (len(body) - self.max_size), 0)
+            data["error"] = encoded_error[:length].decode(errors="ignore")
+            body = self.dumps(data)
+        return body
+
+    def compress(self, body: bytes, encoding: str) -> bytes:
+        key = (encoding, hashlib.sha1(body).digest())
+        with self._lock:
+            compressed = self._cache.get(key)
+            if compressed is not None:
+                self._cache.move_to_end(key)
+                return compressed
+
+        if encoding == "br":
+            compressed = brotli.compress(body, quality=self.brotli_quality)
+        else:
+            compressed = gzip.compress(body, compresslevel=self.gzip_level)
+
+        if len(compressed) > self.cache_max_bytes:
+            return compressed
+
+        with self._lock:
+            if key not in self._cache:
+                self._cache[key] = compressed
+                self._cache_bytes += len(compressed)
+            while len(self._cache) > self.cache_size or self._cache_bytes > self.cache_max_bytes:
+                _, evicted = self._cache.popitem(last=False)
+                self._cache_bytes -= len(evicted)
+        return compressed
@@ -0,0 +1,12 @@
+import hashlib
+import traceback
+
+
+def get_fingerprint(exc: BaseException) -> str:
+    """Identify the error by exception class and the functions of its traceback."""
+    cls = type(exc)
+    parts = [f"{cls.__module__}.{cls.__qualname__}"]
+    parts.extend(
+        f"{frame.f_code.co_filename}:{frame.f_code.co_name}" for frame, _ in traceback.walk_tb(exc.__traceback__)
+    )
+    return hashlib.sha1("\n".join(parts).encode()).hexdigest()[:16]
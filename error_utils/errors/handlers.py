@@ -1,9 +1,13 @@
 import logging
+import weakref
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Any, Type
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type, Union
 
 from error_utils.errors import BaseError
+from error_utils.errors.fingerprints import get_fingerprint
+from error_utils.errors.spool import ErrorSpool
+from error_utils.errors.tracebacks import TracebackPolicy
 from error_utils.errors.types import ErrorType
 
 
@@ -35,20 +39,126 @@ class BaseErrorHandler(AbstractErrorHandler):
 
 
 class ExceptionsProcessor:
-    def __init__(self, *args: Type[AbstractErrorHandler]):
-        self.handlers = []
+    """
+    Resolves exceptions to errors using an ordered chain of handlers.
+
+    A processor may have a parent: its own handlers are tried first, then the parent's ones,
+    so a child overrides or extends the handlers of the parent.
+    The resolved handler is cached per exception type and the cache is reset on any change in the chain.
+    Unhandled errors are recorded to ``spool`` (or the spool of the parent) if it is set.
+    Their tracebacks are logged according to ``traceback_policy`` (or the policy of the parent),
+    in full if there is no policy.
+    """
+
+    def __init__(
+        self,
+        *args: Type[AbstractErrorHandler],
+        parent: "ExceptionsProcessor" = None,
+        spool: ErrorSpool = None,
+        traceback_policy: TracebackPolicy = None,
+    ):
+        self._handlers: Tuple[AbstractErrorHandler, ...] = ()
+        self._parent = None
+        self._children = weakref.WeakSet()
+        self._handlers_cache: Dict[type, Optional[AbstractErrorHandler]] = {}
+        self.spool = spool
+        self.traceback_policy = traceback_policy
+        self.parent = parent
         self.add_handlers(*args)
 
-    def add_handlers(self, *args: Type[AbstractErrorHandler]):
-        self.handlers.extend([
-            handler if isinstance(handler, AbstractErrorHandler) else handler() for handler in args
-        ])
-
-    def get_error(self, exc: Exception) -> Error:
-        for handler in self.handlers:
-            if isinstance(exc, handler.handle_exception):
-                return handler.get_error(exc)
+    @property
+    def handlers(self) -> Tuple[AbstractErrorHandler, ...]:
+        """Handlers of the processor, assign a new sequence or use ``add_handlers`` to change them."""
+        return self._handlers
+
+    @handlers.setter
+    def handlers(self, handlers: Sequence[Union[AbstractErrorHandler, Type[AbstractErrorHandler]]]):
+        self._handlers = tuple(
+            handler if isinstance(handler, AbstractErrorHandler) else handler() for handler in handlers
+        )
+        self._clear_cache()
+
+    @property
+    def parent(self) -> Optional["ExceptionsProcessor"]:
+        return self._parent
+
+    @parent.setter
+    def parent(self, parent: Optional["ExceptionsProcessor"]):
+        if self._parent is not None:
+            self._parent._children.discard(self)
+        self._parent = parent
+        if parent is not None:
+            parent._children.add(self)
+        self._clear_cache()
 
-        logging.exception(exc)
+    def add_handlers(self, *args: Type[AbstractErrorHandler]):
+        self.handlers = self._handlers + args
+
+    def create_child(self, *args: Type[AbstractErrorHandler]) -> "ExceptionsProcessor":
+        """Create processor which handlers take precedence over the handlers of this one."""
+        return ExceptionsProcessor(*args, parent=self)
+
+    def get_handlers_chain(self) -> List[AbstractErrorHandler]:
+        chain = list(self.handlers)
+        if self.parent is not None:
+            chain.extend(self.parent.get_handlers_chain())
+        return chain
+
+    def get_handler(self, exc_type: type) -> Optional[AbstractErrorHandler]:
+        try:
+            return self._handlers_cache[exc_type]
+        except KeyError:
+            pass
+
+        handler = next(
+            (handler for handler in self.get_handlers_chain() if issubclass(exc_type, handler.handle_exception)),
+            None,
+        )
+        self._handlers_cache[exc_type] = handler
+        return handler
+
+    def get_spool(self) -> Optional[ErrorSpool]:
+        if self.spool is None and self.parent is not None:
+            return self.parent.get_spool()
+        return self.spool
+
+    def get_traceback_policy(self) -> Optional[TracebackPolicy]:
+        if self.traceback_policy is None and self.parent is not None:
+            return self.parent.get_traceback_policy()
+        return self.traceback_policy
+
+    def get_error(self, exc: Exception, context: dict = None) -> Error:
+        """
+        :param exc: Exception to convert
+        :param context: Request context stored to the spool for unhandled errors, e.g. method and path
+        """
+        handler = self.get_handler(type(exc))
+        if handler is not None:
+            return handler.get_error(exc)
+
+        self._log_unhandled_error(exc, context)
 
         return Error(status=500, error_type=ErrorType.INTERNAL_ERROR, message=str(exc), detail=None)
+
+    def _log_unhandled_error(self, exc: Exception, context: dict = None):
+        policy = self.get_traceback_policy()
+        spool = self.get_spool()
+        if policy is None:
+            logging.exception(exc)
+            if spool is not None:
+                spool.write(exc, context)
+            return
+
+        fingerprint = get_fingerprint(exc)
+        stack = policy.capture(exc, fingerprint)
+        if stack is None:
+            logging.error("%s (traceback is sampled out, fingerprint: %s)", exc, fingerprint)
+        else:
+            logging.error("%s\n%s", exc, stack)
+        if spool is not None:
+            spool.write(exc, context, fingerprint=fingerprint, sampled=stack is not None)
+
+    def _clear_cache(self):
+        self._handlers_cache.clear()
+        for child in self._children:
+            child._clear_cache()
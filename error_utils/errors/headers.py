@@ -0,0 +1,42 @@
+from functools import lru_cache
+from typing import Optional, Tuple
+
+
+@lru_cache(maxsize=512)
+def parse_quality_values(value: Optional[str]) -> Tuple[Tuple[str, float], ...]:
+    """
+    Parse value of ``Accept-*`` header, e.g. ``Accept-Language`` or ``Accept-Encoding``.
+
+    :param value: Header value
+    :return: Lowercased values with their quality, most preferred first, refused (``q=0``) ones last
+    """
+    if not value:
+        return ()
+
+    weighted = []
+    for position, item in enumerate(value.split(",")):
+        name, *params = [part.strip() for part in item.split(";")]
+        if not name:
+            continue
+        quality = 1.0
+        for param in params:
+            key, _, param_value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(param_value)
+                except ValueError:
+                    quality = 0.0
+        weighted.append((-quality, position, name.lower()))
+
+    return tuple((name, -quality) for quality, _, name in sorted(weighted))
+
+
+@lru_cache(maxsize=512)
+def parse_accept_header(value: Optional[str]) -> Tuple[str, ...]:
+    """
+    Parse value of ``Accept-*`` header.
+
+    :param value: Header value
+    :return: Lowercased values with non-zero quality, most preferred first
+    """
+    return tuple(name for name, quality in parse_quality_values(value) if quality > 0)
@@ -0,0 +1,124 @@
+from enum import Enum
+from http import HTTPStatus
+from typing import Any, Dict, Optional, Type, Union
+
+from error_utils.errors.handlers import Error
+from error_utils.errors.headers import parse_accept_header
+
+MessageKey = Union[str, Type[Exception]]
+
+
+class _FormatDict(dict):
+    def __missing__(self, key: str) -> str:
+        return "{" + key + "}"
+
+
+def _normalize_key(key: Any) -> Any:
+    return key.value if isinstance(key, Enum) else key
+
+
+def _is_default_message(error: Error) -> bool:
+    """Message is empty, equal to the error type or the default text of HTTP errors, e.g. ``404: Not Found``."""
+    if error.message is None or error.message == error.error_type:
+        return True
+    try:
+        return error.message == f"{error.status}: {HTTPStatus(error.status).phrase}"
+    except ValueError:
+        return False
+
+
+class MessageCatalog:
+    """
+    Localized error messages keyed by error type (``ErrorType`` or any string) or by exception class.
+
+    Only default messages (empty, equal to the error type or the default text of HTTP errors like ``404: Not Found``)
+    are localized, explicit messages are kept.
+    A template is formatted with ``detail`` when it is a dict: ``"User {login} not found"``.
+    Bodies of errors without detail are rendered once per locale, copies of them are returned.
+    """
+
+    def __init__(self, default_locale: str = "en"):
+        self.default_locale = default_locale.lower()
+        self._messages: Dict[str, Dict[MessageKey, str]] = {}
+        self._table: Optional[Dict[str, Dict[MessageKey, str]]] = None
+        self._templates: Dict[tuple, Optional[str]] = {}
+        self._bodies: Dict[tuple, dict] = {}
+
+    def add_messages(self, locale: str, messages: Dict[MessageKey, str]):
+        locale_messages = self._messages.setdefault(locale.lower(), {})
+        locale_messages.update({_normalize_key(key): template for key, template in messages.items()})
+        self._table = None
+
+    def compile(self):
+        """Build flat per-locale lookup tables, locales fall back to the messages of the default locale."""
+        default_messages = self._messages.get(self.default_locale, {})
+        table = {locale: {**default_messages, **messages} for locale, messages in self._messages.items()}
+        table.setdefault(self.default_locale, dict(default_messages))
+        self._templates.clear()
+        self._bodies.clear()
+        self._table = table
+
+    def get_locale(self, accept_language: Optional[str]) -> str:
+        if self._table is None:
+            self.compile()
+
+        for language in parse_accept_header(accept_language):
+            if language in self._table:
+                return language
+            primary_language = language.partition("-")[0]
+            if primary_language in self._table:
+                return primary_language
+
+        return self.default_locale
+
+    def get_template(self, locale: str, exc_type: type, error_type: Optional[str]) -> Optional[str]:
+        if self._table is None:
+            self.compile()
+
+        key = (locale, exc_type, error_type)
+        try:
+            return self._templates[key]
+        except KeyError:
+            pass
+
+        messages = self._table.get(locale, {})
+        template = next((messages[cls] for cls in exc_type.__mro__ if cls in messages), None)
+        if template is None:
+            template = messages.get(_normalize_key(error_type))
+
+        self._templates[key] = template
+        return template
+
+    def render(self, error: Error, exc: Exception, accept_language: str = None) -> dict:
+        """
+        Render response body of the error with message in the language preferred by the client.
+
+        :param error: Error returned by ``ExceptionsProcessor``
+        :param exc: Handled exception
+        :param accept_language: Value of ``Accept-Language`` header
+        """
+        if not _is_default_message(error):
+            return dict(error=error.error_type, message=error.message, detail=error.detail)
+
+        locale = self.get_locale(accept_language)
+        if error.detail is None:
+            key = (locale, type(exc), error.error_type)
+            body = self._bodies.get(key)
+            if body is None:
+                template = self.get_template(locale, type(exc), error.error_type)
+                if template is None:
+                    return dict(error=error.error_type, message=error.message, detail=None)
+                body = dict(error=error.error_type, message=template, detail=None)
+                self._bodies[key] = body
+            return dict(body)
+
+        message = self.get_template(locale, type(exc), error.error_type)
+        if message is None:
+            message = error.message
+        elif isinstance(error.detail, dict):
+            try:
+                message = message.format_map(_FormatDict(error.detail))
+            except (AttributeError, IndexError, KeyError, TypeError, ValueError):
+                pass
+
+        return dict(error=error.error_type, message=message, detail=error.detail)
@@ -0,0 +1,245 @@
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+import traceback
+import weakref
+from typing import Iterator, List, Optional
+
+from error_utils.errors.fingerprints import get_fingerprint
+
+
+def get_stack(exc: BaseException, max_frames: int) -> List[str]:
+    """Innermost ``max_frames`` frames of the exception traceback without source lines."""
+    stack = traceback.StackSummary.extract(
+        traceback.walk_tb(exc.__traceback__), limit=-max_frames, lookup_lines=False
+    )
+    return [f"{frame.filename}:{frame.lineno} {frame.name}" for frame in stack]
+
+
+_spools = weakref.WeakSet()
+
+
+def _restart_spools_after_fork():
+    for spool in list(_spools):
+        spool._restart_after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_spools_after_fork)
+
+
+class ErrorSpool:
+    """
+    Append-only local file of unhandled errors, one compact JSON record per line.
+
+    Records are buffered and written in batches by a background thread: every ``flush_interval`` seconds
+    or as soon as ``batch_size`` records are collected, so request handlers don't wait for the disk.
+    The file is synced to disk at most every ``fsync_interval`` seconds and rotated when it exceeds ``max_bytes``,
+    keeping ``backup_count`` previous files (``errors.log.1`` is the newest of them).
+    The spool is closed at interpreter exit, records still buffered are lost only if the process is killed.
+    A forked process, e.g. a worker of a preforking server, gets its own flusher thread.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = 10 * 1024 * 1024,
+        backup_count: int = 5,
+        batch_size: int = 100,
+        flush_interval: float = 1.0,
+        fsync_interval: float = 5.0,
+        max_frames: int = 20,
+        max_message_length: int = 1000,
+    ):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.fsync_interval = fsync_interval
+        self.max_frames = max_frames
+        self.max_message_length = max_message_length
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._buffer: List[bytes] = []
+        self._file = None
+        self._size = 0
+        self._synced = True
+        self._last_fsync = time.monotonic()
+        self._closed = False
+        self._wakeup = threading.Event()
+        self._start_flusher()
+        atexit.register(self.close)
+        _spools.add(self)
+
+    def write(self, exc: BaseException, context: dict = None, fingerprint: str = None, sampled: bool = True):
+        """
+        :param exc: Unhandled exception
+        :param context: Request context
+        :param fingerprint: Precomputed fingerprint of the exception
+        :param sampled: The stack isn't stored if traceback capture of the error is sampled out
+        """
+        cls = type(exc)
+        self.write_record(dict(
+            ts=time.time(),
+            fingerprint=fingerprint or get_fingerprint(exc),
+            type=f"{cls.__module__}.{cls.__qualname__}",
+            message=str(exc)[:self.max_message_length],
+            stack=get_stack(exc, self.max_frames) if sampled else None,
+            sampled=sampled,
+            context=context,
+        ))
+
+    def write_record(self, record: dict):
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":"), default=str) + "\n"
+        with self._lock:
+            self._buffer.append(line.encode())
+            is_full = len(self._buffer) >= self.batch_size
+        if self._closed:
+            self.close()
+        elif is_full:
+            self._wakeup.set()
+
+    def flush(self, fsync: bool = True):
+        with self._io_lock:
+            self._flush(fsync=fsync)
+
+    def close(self):
+        if not self._closed:
+            self._closed = True
+            self._wakeup.set()
+            self._flusher.join()
+            atexit.unregister(self.close)
+        with self._io_lock:
+            self._flush(fsync=True)
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __enter__(self) -> "ErrorSpool":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __iter__(self) -> Iterator[dict]:
+        self.flush(fsync=False)
+        return iter(SpoolReader(self.path))
+
+    def _start_flusher(self):
+        self._flusher = threading.Thread(target=self._run_flusher, name=f"error-spool-{self.path}", daemon=True)
+        self._flusher.start()
+
+    def _restart_after_fork(self):
+        """Reset the state copied from the parent process, whose threads don't exist in the child."""
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        # records buffered by the parent are written by the parent
+        self._buffer = []
+        file, self._file = self._file, None
+        self._synced = True
+        if file is not None:
+            try:
+                file.close()
+            except (OSError, ValueError):
+                pass
+        if not self._closed:
+            self._start_flusher()
+
+    def _run_flusher(self):
+        while not self._closed:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush(fsync=False)
+
+    def _flush(self, fsync: bool = False):
+        with self._lock:
+            lines, self._buffer = self._buffer, []
+
+        now = time.monotonic()
+        try:
+            if lines:
+                if self._file is None:
+                    self._open()
+                chunk = []
+                for line in lines:
+                    if self._size and self._size + len(line) > self.max_bytes:
+                        self._file.write(b"".join(chunk))
+                        chunk = []
+                        self._rotate()
+                        self._open()
+                    chunk.append(line)
+                    self._size += len(line)
+                self._file.write(b"".join(chunk))
+                self._file.flush()
+                self._synced = False
+            if not self._synced and (fsync or now - self._last_fsync >= self.fsync_interval):
+                os.fsync(self._file.fileno())
+                self._synced = True
+                self._last_fsync = now
+        except (OSError, ValueError):
+            logging.exception("Failed to write errors to spool %s", self.path)
+
+    def _open(self):
+        self._file = open(self.path, "ab")
+        self._size = os.fstat(self._file.fileno()).st_size
+
+    def _rotate(self):
+        file, self._file = self._file, None
+        self._synced = True
+        try:
+            file.flush()
+            os.fsync(file.fileno())
+        finally:
+            file.close()
+        if self.backup_count > 0:
+            for index in range(self.backup_count - 1, 0, -1):
+                source = f"{self.path}.{index}"
+                if os.path.exists(source):
+                    os.replace(source, f"{self.path}.{index + 1}")
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+
+class SpoolReader:
+    """Streams records of the spool and its rotated files, oldest first, reading one line at a time."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def get_files(self) -> List[str]:
+        files = []
+        index = 1
+        while os.path.exists(f"{self.path}.{index}"):
+            files.append(f"{self.path}.{index}")
+            index += 1
+        files.reverse()
+        if os.path.exists(self.path):
+            files.append(self.path)
+        return files
+
+    def __iter__(self) -> Iterator[dict]:
+        for file_name in self.get_files():
+            yield from self.read_file(file_name)
+
+    @staticmethod
+    def read_file(file_name: str) -> Iterator[dict]:
+        with open(file_name, "rb") as file:
+            for line in file:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    # the last record may be partially written if the process crashed
+                    continue
+
+
+def read_spool(path: str, fingerprint: Optional[str] = None) -> Iterator[dict]:
+    """Iterate over records of the spool, optionally only the ones with the fingerprint."""
+    for record in SpoolReader(path):
+        if fingerprint is None or record.get("fingerprint") == fingerprint:
+            yield record
@@ -0,0 +1,63 @@
+import json
+import logging
+from enum import Enum
+from typing import Optional, Union
+
+from error_utils.errors.handlers import Error, ExceptionsProcessor
+from error_utils.errors.types import ErrorType
+
+
+class StreamFormat(str, Enum):
+    NDJSON = "ndjson"
+    SSE = "sse"
+
+    @property
+    def media_type(self) -> str:
+        return _MEDIA_TYPES[self]
+
+
+_MEDIA_TYPES = {
+    StreamFormat.NDJSON: "application/x-ndjson",
+    StreamFormat.SSE: "text/event-stream",
+}
+
+
+def render_error_frame(
+    error: Error, stream_format: StreamFormat = StreamFormat.NDJSON, last_chunk: Optional[Union[bytes, str]] = None
+) -> bytes:
+    """
+    Render the error as the final frame of a streamed body whose headers are already sent:
+    a ``{"error": ...}`` line for NDJSON or an ``event: error`` message for server-sent events.
+
+    The frame starts with a record separator, so it isn't glued to a partially sent record,
+    unless ``last_chunk``, the last chunk sent before, is known to end on one (``b""`` if nothing was sent).
+    """
+    data = json.dumps(
+        dict(error=error.error_type, message=error.message, detail=error.detail, status=error.status),
+        default=str,
+    )
+    if stream_format == StreamFormat.SSE:
+        return f"{_get_frame_separator(last_chunk, stream_format)}event: error\ndata: {data}\n\n".encode()
+    return f"{_get_frame_separator(last_chunk, stream_format)}{data}\n".encode()
+
+
+def _get_frame_separator(last_chunk: Optional[Union[bytes, str]], stream_format: StreamFormat) -> str:
+    if isinstance(last_chunk, str):
+        last_chunk = last_chunk.encode()
+    separator = b"\n\n" if stream_format == StreamFormat.SSE else b"\n"
+    if last_chunk is None:
+        return separator.decode()
+    if not last_chunk or last_chunk.endswith(separator):
+        return ""
+    if stream_format == StreamFormat.SSE and last_chunk.endswith(b"\n"):
+        return "\n"
+    return separator.decode()
+
+
+def get_stream_error(exceptions_handler: ExceptionsProcessor, exc: Exception, context: dict = None) -> Error:
+    """Convert the exception for the final frame, never raises as the response can't be replaced anymore."""
+    try:
+        return exceptions_handler.get_error(exc, context=context)
+    except Exception:
+        logging.exception("Failed to handle error of streamed response")
+        return Error(status=500, error_type=ErrorType.INTERNAL_ERROR, message=ErrorType.INTERNAL_ERROR)
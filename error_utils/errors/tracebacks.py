@@ -0,0 +1,123 @@
+import os
+import random
+import sysconfig
+import threading
+import traceback
+from collections import Counter
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from error_utils.errors.fingerprints import get_fingerprint
+
+_CAUSE_MESSAGE = "\nThe above exception was the direct cause of the following exception:\n\n"
+_CONTEXT_MESSAGE = "\nDuring handling of the above exception, another exception occurred:\n\n"
+_LIBRARY_DIRECTORIES = (f"{os.sep}site-packages{os.sep}", f"{os.sep}dist-packages{os.sep}")
+
+
+def get_library_paths() -> Tuple[str, ...]:
+    paths = sysconfig.get_paths()
+    return tuple({paths["purelib"], paths["platlib"]})
+
+
+class TracebackPolicy:
+    """
+    Limits the cost of traceback capture for unhandled errors.
+
+    :param sample_rate: Share of errors with captured traceback, per fingerprint
+    :param sample_rates: Sample rates overriding ``sample_rate`` for the fingerprints
+    :param max_depth: Number of innermost frames kept for each exception
+    :param max_chain: Number of exceptions kept from the ``__cause__``/``__context__`` chain
+    :param exclude_library_frames: Skip frames of installed packages (site-packages) and ``library_paths``
+    :param library_paths: Additional path prefixes of library frames
+    :param seed: Seed of sampling, makes it deterministic
+
+    Numbers of captured and sampled out errors are counted per fingerprint in ``captured`` and ``sampled_out``.
+    """
+
+    def __init__(
+        self,
+        sample_rate: float = 1.0,
+        sample_rates: Dict[str, float] = None,
+        max_depth: int = None,
+        max_chain: int = None,
+        exclude_library_frames: bool = False,
+        library_paths: Sequence[str] = (),
+        seed: int = None,
+    ):
+        self.sample_rate = sample_rate
+        self.sample_rates = sample_rates or {}
+        self.max_depth = max_depth
+        self.max_chain = max_chain
+        self.exclude_library_frames = exclude_library_frames
+        self.library_paths = get_library_paths() + tuple(library_paths)
+        self.captured = Counter()
+        self.sampled_out = Counter()
+        self._random = random.Random(seed)
+        self._library_files: Dict[str, bool] = {}
+        self._lock = threading.Lock()
+
+    def should_capture(self, fingerprint: str) -> bool:
+        rate = self.sample_rates.get(fingerprint, self.sample_rate)
+        with self._lock:
+            captured = rate >= 1 or (rate > 0 and self._random.random() < rate)
+            if captured:
+                self.captured[fingerprint] += 1
+            else:
+                self.sampled_out[fingerprint] += 1
+        return captured
+
+    def capture(self, exc: BaseException, fingerprint: str = None) -> Optional[str]:
+        """Format traceback of the exception, ``None`` if the error is sampled out."""
+        if not self.should_capture(fingerprint or get_fingerprint(exc)):
+            return None
+        return self.format(exc)
+
+    def format(self, exc: BaseException) -> str:
+        lines: List[str] = []
+        chain = list(self._walk_chain(exc))
+        if self.max_chain is not None and len(chain) > self.max_chain:
+            chain = chain[:self.max_chain]
+            lines.append("(earlier chained exceptions are omitted)\n")
+
+        for current, message in reversed(chain):
+            if current.__traceback__ is not None:
+                lines.append("Traceback (most recent call last):\n")
+                lines.extend(self.extract(current.__traceback__).format())
+            lines.extend(traceback.format_exception_only(type(current), current))
+            if message:
+                lines.append(message)
+
+        return "".join(lines).rstrip("\n")
+
+    def extract(self, tb) -> traceback.StackSummary:
+        frames = traceback.walk_tb(tb)
+        if self.exclude_library_frames:
+            frames = ((frame, lineno) for frame, lineno in frames if not self.is_library_file(frame.f_code.co_filename))
+        limit = -self.max_depth if self.max_depth is not None else None
+        return traceback.StackSummary.extract(frames, limit=limit)
+
+    def is_library_file(self, filename: str) -> bool:
+        try:
+            return self._library_files[filename]
+        except KeyError:
+            pass
+
+        is_library = filename.startswith(self.library_paths) or any(
+            directory in filename for directory in _LIBRARY_DIRECTORIES
+        )
+        self._library_files[filename] = is_library
+        return is_library
+
+    @staticmethod
+    def _walk_chain(exc: BaseException) -> Iterator[Tuple[BaseException, Optional[str]]]:
+        """Exceptions from the last raised one with the message linking the next one to it."""
+        seen = set()
+        current, message = exc, None
+        while current is not None and id(current) not in seen:
+            seen.add(id(current))
+            yield current, message
+            if current.__cause__ is not None:
+                current, message = current.__cause__, _CAUSE_MESSAGE
+            elif current.__context__ is not None and not current.__suppress_context__:
+                current, message = current.__context__, _CONTEXT_MESSAGE
+            else:
+                current = None
@@ -1,10 +1,30 @@
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterable, Union
+
+from aiohttp.web_app import Application
 from aiohttp.web_exceptions import HTTPError
 from aiohttp.web_middlewares import middleware
 from aiohttp.web_request import Request
-from aiohttp.web_response import Response, json_response
+from aiohttp.web_response import Response, StreamResponse, json_response
 from inflection import parameterize, underscore
 
-from error_utils.errors import BaseErrorHandler, ExceptionsProcessor, Error
+try:
+    from aiohttp.web_app import AppKey
+except ImportError:
+    AppKey = None
+
+from error_utils.errors import (
+    BaseErrorHandler,
+    Error,
+    ErrorBodyEncoder,
+    ExceptionsProcessor,
+    MessageCatalog,
+    StreamFormat,
+    get_stream_error,
+    render_error_frame,
+)
+from error_utils.errors.compression import get_encoding_headers
 
 
 class AiohttpErrorHandler(BaseErrorHandler):
@@ -23,16 +43,123 @@ AIOHTTP_ERROR_HANDLERS = [
     BaseErrorHandler,
 ]
 
+DEFAULT_EXCEPTIONS_PROCESSOR = ExceptionsProcessor(*AIOHTTP_ERROR_HANDLERS)
+
+
+if AppKey is None:
+    EXCEPTIONS_PROCESSOR_KEY = "error_utils_exceptions_processor"
+else:
+    EXCEPTIONS_PROCESSOR_KEY = AppKey("error_utils_exceptions_processor", ExceptionsProcessor)
+
+
+def set_exceptions_processor(app: Application, exceptions_handler: ExceptionsProcessor):
+    """Use the processor for the requests routed to the application or its sub-applications."""
+    app[EXCEPTIONS_PROCESSOR_KEY] = exceptions_handler
+
+
+def get_exceptions_processor(request: Request, default: ExceptionsProcessor = None) -> ExceptionsProcessor:
+    """Processor of the innermost application the request is routed to, ``default`` if none is set."""
+    for app in reversed(request.match_info.apps):
+        processor = app.get(EXCEPTIONS_PROCESSOR_KEY)
+        if processor is not None:
+            return processor
+    return default
 
-def create_error_handling_middleware(exceptions_handler: ExceptionsProcessor) -> middleware:
+
+def create_error_handling_middleware(
+    exceptions_handler: ExceptionsProcessor,
+    message_catalog: MessageCatalog = None,
+    body_encoder: ErrorBodyEncoder = None,
+) -> middleware:
 
     @middleware
     async def handle_errors(request: Request, handler) -> Response:
         try:
             return await handler(request)
         except Exception as ex:
-            error = exceptions_handler.get_error(ex)
-            data = dict(error=error.error_type, message=error.message, detail=error.detail)
-            return json_response(status=error.status, data=data)
+            processor = get_exceptions_processor(request, exceptions_handler)
+            error = processor.get_error(ex, context=dict(method=request.method, path=request.path))
+            if message_catalog is None:
+                data = dict(error=error.error_type, message=error.message, detail=error.detail)
+            else:
+                data = message_catalog.render(error, ex, request.headers.get("Accept-Language"))
+            if body_encoder is None:
+                return json_response(status=error.status, data=data)
+            body, encoding = body_encoder.encode(data, request.headers.get("Accept-Encoding"))
+            return Response(
+                body=body,
+                status=error.status,
+                content_type="application/json",
+                headers=get_encoding_headers(encoding),
+            )
 
     return handle_errors
+
+
+@asynccontextmanager
+async def handle_stream_errors(
+    request: Request,
+    response: StreamResponse,
+    exceptions_handler: ExceptionsProcessor = None,
+    stream_format: StreamFormat = StreamFormat.NDJSON,
+):
+    """
+    Finish prepared stream response with an error frame if the block raises, instead of breaking the connection:
+
+        async with handle_stream_errors(request, response):
+            async for row in rows:
+                await response.write(row)
+
+    Errors raised before the response is prepared are re-raised to be handled by the middleware.
+    The processor of the application set by ``set_exceptions_processor`` is used by default,
+    processor with ``AIOHTTP_ERROR_HANDLERS`` if there is none.
+    The error frame starts with a record separator as the block may stop in the middle of a record.
+    """
+    try:
+        yield
+    except Exception as ex:
+        if not response.prepared or isinstance(ex, ConnectionResetError):
+            raise
+        await _write_error_frame(request, response, ex, exceptions_handler, stream_format)
+
+
+async def _write_error_frame(
+    request: Request,
+    response: StreamResponse,
+    exception: Exception,
+    exceptions_handler: ExceptionsProcessor = None,
+    stream_format: StreamFormat = StreamFormat.NDJSON,
+    last_chunk: bytes = None,
+):
+    processor = exceptions_handler or get_exceptions_processor(request, DEFAULT_EXCEPTIONS_PROCESSOR)
+    error = get_stream_error(processor, exception, context=dict(method=request.method, path=request.path))
+    try:
+        await response.write(render_error_frame(error, stream_format, last_chunk))
+        await response.write_eof()
+    except Exception:
+        logging.exception("Failed to write error frame of streamed response")
+
+
+async def stream_response(
+    request: Request,
+    chunks: AsyncIterable[Union[bytes, str]],
+    exceptions_handler: ExceptionsProcessor = None,
+    stream_format: StreamFormat = StreamFormat.NDJSON,
+    response: StreamResponse = None,
+) -> StreamResponse:
+    """Stream the chunks, ending the body with an error frame if iteration fails."""
+    if response is None:
+        response = StreamResponse(headers={"Content-Type": stream_format.media_type})
+    await response.prepare(request)
+    last_chunk = b""
+    try:
+        async for chunk in chunks:
+            chunk = chunk.encode() if isinstance(chunk, str) else chunk
+            if chunk:
+                last_chunk = chunk
+            await response.write(chunk)
+    except ConnectionResetError:
+        raise
+    except Exception as ex:
+        await _write_error_frame(request, response, ex, exceptions_handler, stream_format, last_chunk)
+    return response
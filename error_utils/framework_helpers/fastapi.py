@@ -1,3 +1,5 @@
+from typing import AsyncIterable, AsyncIterator, Iterable, Iterator, Union
+
 from fastapi.exceptions import RequestValidationError
 from inflection import parameterize, underscore
 from starlette.exceptions import HTTPException
@@ -5,7 +7,17 @@ from starlette.requests import Request
 from starlette.responses import Response, JSONResponse
 from starlette.status import HTTP_400_BAD_REQUEST
 
-from error_utils.errors import BaseErrorHandler, Error, ExceptionsProcessor
+from error_utils.errors import (
+    BaseErrorHandler,
+    Error,
+    ErrorBodyEncoder,
+    ExceptionsProcessor,
+    MessageCatalog,
+    StreamFormat,
+    get_stream_error,
+    render_error_frame,
+)
+from error_utils.errors.compression import get_encoding_headers
 from error_utils.errors.types import ErrorType
 
 
@@ -39,14 +51,102 @@ FASTAPI_ERROR_HANDLERS = [
 ]
 
 
-def create_error_handling_middleware(exceptions_handler: ExceptionsProcessor = None):
+EXCEPTIONS_PROCESSOR_STATE_KEY = "error_utils_exceptions_processor"
+
+
+def use_exceptions_processor(exceptions_handler: ExceptionsProcessor):
+    """
+    Create dependency selecting the processor for the router or route it is attached to:
+
+        router = APIRouter(dependencies=[Depends(use_exceptions_processor(processor))])
+
+    The processor is found on the matched route, so it handles errors of the dependencies declared before it too.
+    """
+
+    def set_exceptions_processor(request: Request):
+        setattr(request.state, EXCEPTIONS_PROCESSOR_STATE_KEY, exceptions_handler)
+
+    set_exceptions_processor.exceptions_processor = exceptions_handler
+    return set_exceptions_processor
+
+
+def get_exceptions_processor(request: Request, default: ExceptionsProcessor = None) -> ExceptionsProcessor:
+    """Processor selected by ``use_exceptions_processor`` for the matched route, ``default`` if there is none."""
+    route = request.scope.get("route")
+    for dependency in reversed(getattr(route, "dependencies", ())):
+        processor = getattr(dependency.dependency, "exceptions_processor", None)
+        if processor is not None:
+            return processor
+    return getattr(request.state, EXCEPTIONS_PROCESSOR_STATE_KEY, default)
+
+
+def create_error_handling_middleware(
+    exceptions_handler: ExceptionsProcessor = None,
+    message_catalog: MessageCatalog = None,
+    body_encoder: ErrorBodyEncoder = None,
+):
 
     async def handle_errors(request: Request, handler) -> Response:
         try:
             return await handler(request)
         except Exception as ex:
-            error = exceptions_handler.get_error(ex)
-            data = dict(error=error.error_type, message=error.message, detail=error.detail)
-            return JSONResponse(status_code=error.status, content=data)
+            processor = get_exceptions_processor(request, exceptions_handler)
+            error = processor.get_error(ex, context=dict(method=request.method, path=request.url.path))
+            if message_catalog is None:
+                data = dict(error=error.error_type, message=error.message, detail=error.detail)
+            else:
+                data = message_catalog.render(error, ex, request.headers.get("Accept-Language"))
+            if body_encoder is None:
+                return JSONResponse(status_code=error.status, content=data)
+            body, encoding = body_encoder.encode(data, request.headers.get("Accept-Encoding"))
+            return Response(
+                content=body,
+                status_code=error.status,
+                media_type="application/json",
+                headers=get_encoding_headers(encoding),
+            )
 
     return handle_errors
+
+
+def handle_stream_errors(
+    content: Union[Iterable, AsyncIterable],
+    exceptions_handler: ExceptionsProcessor,
+    stream_format: StreamFormat = StreamFormat.NDJSON,
+    context: dict = None,
+) -> Union[Iterator, AsyncIterator]:
+    """
+    Wrap body iterator of ``StreamingResponse`` to end the body with an error frame if iteration fails,
+    as headers are already sent and the error can't be returned as a separate response:
+
+        StreamingResponse(handle_stream_errors(rows(), processor), media_type=StreamFormat.NDJSON.media_type)
+    """
+    if hasattr(content, "__aiter__"):
+        return _handle_async_stream_errors(content, exceptions_handler, stream_format, context)
+    return _handle_sync_stream_errors(content, exceptions_handler, stream_format, context)
+
+
+async def _handle_async_stream_errors(
+    content: AsyncIterable, exceptions_handler: ExceptionsProcessor, stream_format: StreamFormat, context: dict
+) -> AsyncIterator:
+    last_chunk = b""
+    try:
+        async for chunk in content:
+            if chunk:
+                last_chunk = chunk
+            yield chunk
+    except Exception as ex:
+        yield render_error_frame(get_stream_error(exceptions_handler, ex, context), stream_format, last_chunk)
+
+
+def _handle_sync_stream_errors(
+    content: Iterable, exceptions_handler: ExceptionsProcessor, stream_format: StreamFormat, context: dict
+) -> Iterator:
+    last_chunk = b""
+    try:
+        for chunk in content:
+            if chunk:
+                last_chunk = chunk
+            yield chunk
+    except Exception as ex:
+        yield render_error_frame(get_stream_error(exceptions_handler, ex, context), stream_format, last_chunk)
@@ -1,8 +1,10 @@
-from typing import Tuple
+from typing import Any, Tuple
 
-from tornado.web import HTTPError
+from tornado.escape import json_encode
+from tornado.web import HTTPError, RequestHandler
 
-from error_utils.errors import BaseErrorHandler, Error, ExceptionsProcessor
+from error_utils.errors import BaseErrorHandler, Error, ErrorBodyEncoder, ExceptionsProcessor, MessageCatalog
+from error_utils.errors.compression import get_encoding_headers
 from error_utils.errors.types import ErrorType
 
 
@@ -22,8 +24,50 @@ TORNADO_ERROR_HANDLERS = [
     TornadoErrorHandler,
 ]
 
+DEFAULT_EXCEPTIONS_PROCESSOR = ExceptionsProcessor(*TORNADO_ERROR_HANDLERS)
 
-def handle_error(exception: Exception, processor: ExceptionsProcessor) -> Tuple[int, dict]:
-    error = processor.get_error(exc=exception)
-    data = dict(error=error.error_type, message=error.message, detail=error.detail)
+
+def handle_error(
+    exception: Exception,
+    processor: ExceptionsProcessor,
+    message_catalog: MessageCatalog = None,
+    accept_language: str = None,
+    context: dict = None,
+) -> Tuple[int, dict]:
+    error = processor.get_error(exc=exception, context=context)
+    if message_catalog is None:
+        data = dict(error=error.error_type, message=error.message, detail=error.detail)
+    else:
+        data = message_catalog.render(error, exception, accept_language)
     return error.status, data
+
+
+class ErrorHandlingMixin:
+    """
+    Mixin for ``RequestHandler`` rendering errors with ``exceptions_processor`` of the handler class,
+    so views may override the processor, e.g. with a child of the common one.
+    Processor with ``TORNADO_ERROR_HANDLERS`` is used if it isn't set.
+    Messages are localized with ``message_catalog`` and large bodies are compressed with ``body_encoder`` if set.
+    """
+    exceptions_processor: ExceptionsProcessor = None
+    message_catalog: MessageCatalog = None
+    body_encoder: ErrorBodyEncoder = None
+
+    def write_error(self: RequestHandler, status_code: int, **kwargs: Any) -> None:
+        exception = kwargs["exc_info"][1] if "exc_info" in kwargs else HTTPError(status_code)
+        status_code, data = handle_error(
+            exception,
+            self.exceptions_processor or DEFAULT_EXCEPTIONS_PROCESSOR,
+            message_catalog=self.message_catalog,
+            accept_language=self.request.headers.get("Accept-Language"),
+            context=dict(method=self.request.method, path=self.request.path),
+        )
+        self.set_status(status_code)
+        self.set_header("Content-Type", "application/json; charset=UTF-8")
+        if self.body_encoder is None:
+            self.write(json_encode(data))
+            return
+        body, encoding = self.body_encoder.encode(data, self.request.headers.get("Accept-Encoding"))
+        for name, value in get_encoding_headers(encoding).items():
+            self.set_header(name, value)
+        self.write(body)
@@ -1,4 +1,5 @@
 import asyncio
+import json
 
 import pytest
 from aiohttp import web
@@ -7,13 +8,20 @@ from marshmallow import Schema, fields
 from marshmallow.exceptions import ValidationError
 
 from error_utils.errors.types import ErrorType
-from error_utils.framework_helpers.aiohttp import AIOHTTP_ERROR_HANDLERS, create_error_handling_middleware
+from error_utils.framework_helpers.aiohttp import (
+    AIOHTTP_ERROR_HANDLERS,
+    create_error_handling_middleware,
+    set_exceptions_processor,
+    stream_response,
+)
 from error_utils.errors import (
     AccessDeniedError,
     AuthorizationError,
     Error,
+    ErrorBodyEncoder,
     ExceptionsProcessor,
     InternalError,
+    MessageCatalog,
 )
 from error_utils.errors.handlers import BaseErrorHandler
 
@@ -67,15 +75,46 @@ async def division_by_zero_error(request):
     return 25 / 0
 
 
+async def stream_error(request):
+
+    async def rows():
+        yield '{"id": 1}\n'
+        raise AccessDeniedError()
+
+    return await stream_response(request, rows())
+
+
+async def partial_stream_error(request):
+
+    async def chunks():
+        yield '{"id": 1}\n{"id"'
+        raise AccessDeniedError()
+
+    return await stream_response(request, chunks())
+
+
+class PublicValidationErrorHandler(BaseErrorHandler):
+    handle_exception = ValidationError
+
+    def get_error(self, exc: ValidationError) -> Error:
+        return Error(status=422, error_type=ErrorType.VALIDATION_ERROR, message=ErrorType.VALIDATION_ERROR)
+
+
 @pytest.fixture
 def app():
+    processor = ExceptionsProcessor(ValidationErrorHandler, *AIOHTTP_ERROR_HANDLERS)
     app = Application(
         middlewares=[
-            create_error_handling_middleware(
-                ExceptionsProcessor(ValidationErrorHandler, *AIOHTTP_ERROR_HANDLERS)
-            )
+            create_error_handling_middleware(processor)
         ]
     )
+    set_exceptions_processor(app, processor)
+    public_app = Application()
+    set_exceptions_processor(public_app, processor.create_child(PublicValidationErrorHandler))
+    public_app.add_routes([
+        web.post("/validation_error", validation_error),
+        web.get("/access_denied_error", access_denied_error),
+    ])
     app.add_routes([
         web.get("/", success),
         web.get("/base_error", base_error),
@@ -85,7 +124,10 @@ def app():
         web.get("/authorization_error", authorization_error),
         web.get("/rewrite_authorization_error", rewrite_authorization_error),
         web.get("/division_by_zero_error", division_by_zero_error),
+        web.get("/stream_error", stream_error),
+        web.get("/partial_stream_error", partial_stream_error),
     ])
+    app.add_subapp("/public", public_app)
     return app
 
 
@@ -179,3 +221,136 @@ async def test_division_by_zero_error(client):
         "message": "division by zero",
         "detail": None,
     }
+
+
+async def test_sub_app_validation_error(client):
+    resp = await client.post("/public/validation_error", json={"wrong": "field"})
+
+    assert resp.status == 422
+    assert await resp.json() == {
+        "error": "VALIDATION_ERROR",
+        "message": "VALIDATION_ERROR",
+        "detail": None,
+    }
+
+
+async def test_sub_app_inherits_parent_handlers(client):
+    resp = await client.get("/public/access_denied_error")
+
+    assert resp.status == 403
+    assert await resp.json() == {
+        "error": "ACCESS_DENIED",
+        "message": "ACCESS_DENIED",
+        "detail": None
+    }
+
+
+async def test_localized_error(aiohttp_client):
+    catalog = MessageCatalog()
+    catalog.add_messages("ru", {ErrorType.ACCESS_DENIED: "Доступ запрещен"})
+    app = Application(
+        middlewares=[
+            create_error_handling_middleware(ExceptionsProcessor(*AIOHTTP_ERROR_HANDLERS), message_catalog=catalog)
+        ]
+    )
+    app.add_routes([web.get("/access_denied_error", access_denied_error)])
+    client = await aiohttp_client(app)
+
+    resp = await client.get("/access_denied_error", headers={"Accept-Language": "ru-RU,ru;q=0.9,en;q=0.8"})
+
+    assert resp.status == 403
+    assert await resp.json() == {
+        "error": "ACCESS_DENIED",
+        "message": "Доступ запрещен",
+        "detail": None
+    }
+
+
+async def test_stream_error(client):
+    resp = await client.get("/stream_error")
+
+    assert resp.status == 200
+    assert resp.headers["Content-Type"] == "application/x-ndjson"
+    assert [json.loads(line) for line in (await resp.text()).splitlines()] == [
+        {"id": 1},
+        {"error": "ACCESS_DENIED", "message": "ACCESS_DENIED", "detail": None, "status": 403},
+    ]
+
+
+async def test_partial_stream_error(client):
+    resp = await client.get("/partial_stream_error")
+
+    assert (await resp.text()).splitlines() == [
+        '{"id": 1}',
+        '{"id"',
+        '{"error": "ACCESS_DENIED", "message": "ACCESS_DENIED", "detail": null, "status": 403}',
+    ]
+
+
+async def test_compressed_validation_error(aiohttp_client):
+    app = Application(
+        middlewares=[
+            create_error_handling_middleware(
+                ExceptionsProcessor(ValidationErrorHandler, *AIOHTTP_ERROR_HANDLERS),
+                body_encoder=ErrorBodyEncoder(min_size=100),
+            )
+        ]
+    )
+    app.add_routes([web.post("/validation_error", validation_error)])
+    client = await aiohttp_client(app)
+
+    resp = await client.post(
+        "/validation_error", json={f"field_{index}": index for index in range(10)}, headers={"Accept-Encoding": "gzip"}
+    )
+
+    assert resp.status == 400
+    assert resp.headers["Content-Encoding"] == "gzip"
+    assert resp.headers["Vary"] == "Accept-Encoding"
+    data = await resp.json()
+    assert data["error"] == "VALIDATION_ERROR"
+    assert len(data["detail"]) == 11
+
+
+async def test_localized_routing_error(aiohttp_client):
+    catalog = MessageCatalog()
+    catalog.add_messages("ru", {ErrorType.NOT_FOUND: "Не найдено"})
+    app = Application(
+        middlewares=[
+            create_error_handling_middleware(ExceptionsProcessor(*AIOHTTP_ERROR_HANDLERS), message_catalog=catalog)
+        ]
+    )
+    client = await aiohttp_client(app)
+
+    resp = await client.get("/not_found", headers={"Accept-Language": "ru"})
+
+    assert resp.status == 404
+    assert await resp.json() == {
+        "error": "NOT_FOUND",
+        "message": "Не найдено",
+        "detail": None
+    }
+
+
+async def test_not_found_error(client):
+    resp = await client.get("/not_found")
+
+    assert resp.status == 404
+    assert await resp.json() == {
+        "error": "NOT_FOUND",
+        "message": "404: Not Found",
+        "detail": None
+    }
+
+
+async def test_stream_error_without_processor(aiohttp_client):
+    app = Application()
+    app.add_routes([web.get("/stream_error", stream_error)])
+    client = await aiohttp_client(app)
+
+    resp = await client.get("/stream_error")
+
+    assert resp.status == 200
+    assert [json.loads(line) for line in (await resp.text()).splitlines()] == [
+        {"id": 1},
+        {"error": "ACCESS_DENIED", "message": "ACCESS_DENIED", "detail": None, "status": 403},
+    ]
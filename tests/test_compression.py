@@ -0,0 +1,116 @@
+import gzip
+import json
+
+from error_utils.errors import ErrorBodyEncoder
+from error_utils.errors.compression import get_encoding, get_encoding_headers
+
+
+def get_body(detail_size: int) -> dict:
+    return {
+        "error": "VALIDATION_ERROR",
+        "message": "VALIDATION_ERROR",
+        "detail": [{"loc": ["body", index], "msg": "field required"} for index in range(detail_size)],
+    }
+
+
+def test_get_encoding():
+    assert get_encoding("gzip, deflate") == "gzip"
+    assert get_encoding("*") == "gzip"
+    assert get_encoding("gzip;q=0, identity") is None
+    assert get_encoding("gzip;q=0, *") is None
+    assert get_encoding("identity, *;q=0.5") == "gzip"
+    assert get_encoding(None) is None
+
+
+def test_small_body_is_not_compressed():
+    body, encoding = ErrorBodyEncoder(min_size=1024).encode(get_body(1), "gzip")
+
+    assert encoding is None
+    assert json.loads(body) == get_body(1)
+
+
+def test_large_body_is_compressed():
+    body, encoding = ErrorBodyEncoder(min_size=1024).encode(get_body(100), "gzip")
+
+    assert encoding == "gzip"
+    assert json.loads(gzip.decompress(body)) == get_body(100)
+    assert get_encoding_headers(encoding) == {"Content-Encoding": "gzip", "Vary": "Accept-Encoding"}
+
+
+def test_body_is_not_compressed_if_client_does_not_accept_it():
+    body, encoding = ErrorBodyEncoder(min_size=0).encode(get_body(100), "identity")
+
+    assert encoding is None
+    assert json.loads(body) == get_body(100)
+
+
+def test_compressed_body_is_cached():
+    encoder = ErrorBodyEncoder(min_size=0)
+
+    first, _ = encoder.encode(get_body(100), "gzip")
+    second, _ = encoder.encode(get_body(100), "gzip")
+
+    assert first is second
+
+
+def test_cache_size():
+    encoder = ErrorBodyEncoder(min_size=0, cache_size=2)
+
+    bodies = [encoder.encode(get_body(detail_size), "gzip")[0] for detail_size in range(5)]
+
+    assert encoder.encode(get_body(4), "gzip")[0] is bodies[4]
+    assert encoder.encode(get_body(3), "gzip")[0] is bodies[3]
+    assert encoder.encode(get_body(0), "gzip")[0] is not bodies[0]
+
+
+def test_cache_max_bytes():
+    encoder = ErrorBodyEncoder(min_size=0, cache_max_bytes=2048)
+
+    bodies = [encoder.encode(get_body(detail_size), "gzip")[0] for detail_size in range(100, 120)]
+
+    assert encoder.encode(get_body(119), "gzip")[0] is bodies[-1]
+    assert encoder.encode(get_body(100), "gzip")[0] is not bodies[0]
+
+
+def test_body_larger_than_cache_is_not_cached():
+    encoder = ErrorBodyEncoder(min_size=0, cache_max_bytes=16)
+
+    first, _ = encoder.encode(get_body(100), "gzip")
+    second, _ = encoder.encode(get_body(100), "gzip")
+
+    assert first == second
+    assert first is not second
+
+
+def test_list_detail_is_truncated():
+    body, _ = ErrorBodyEncoder(max_size=1024).encode(get_body(100))
+    data = json.loads(body)
+
+    assert len(body) <= 1024
+    assert data["truncated"] is True
+    assert 0 < len(data["detail"]) < 100
+    assert data["detail"] == get_body(100)["detail"][:len(data["detail"])]
+
+
+def test_other_detail_is_dropped():
+    body, _ = ErrorBodyEncoder(max_size=1024).encode({"error": "ERROR", "message": "ERROR", "detail": "x" * 2048})
+
+    assert json.loads(body) == {"error": "ERROR", "message": "ERROR", "detail": None, "truncated": True}
+
+
+def test_message_is_truncated():
+    body, _ = ErrorBodyEncoder(max_size=1024).encode({"error": "ERROR", "message": "ы" * 2048, "detail": None})
+
+    assert len(body) <= 1024
+    assert json.loads(body)["message"].startswith("ы")
+
+
+def test_body_with_large_fields_is_reduced_to_error_type():
+    encoder = ErrorBodyEncoder(max_size=200)
+
+    body, _ = encoder.encode({"error": "ERROR", "message": "ERROR", "detail": None, "context": "x" * 500})
+    assert json.loads(body) == {"error": "ERROR", "truncated": True}
+
+    body, _ = encoder.encode({"error": "E" * 500, "message": "ERROR", "detail": None})
+    assert len(body) <= 200
+    assert json.loads(body)["error"].startswith("E")
@@ -0,0 +1,98 @@
+import pytest
+
+from error_utils.errors import (
+    AbstractErrorHandler,
+    AccessDeniedError,
+    BaseError,
+    BaseErrorHandler,
+    Error,
+    ExceptionsProcessor,
+    NotFoundError,
+)
+
+
+class NotFoundErrorHandler(AbstractErrorHandler):
+    handle_exception = NotFoundError
+
+    def get_error(self, exc: NotFoundError) -> Error:
+        return Error(status=410, error_type="GONE", message="GONE")
+
+
+class KeyErrorHandler(AbstractErrorHandler):
+    handle_exception = KeyError
+
+    def get_error(self, exc: KeyError) -> Error:
+        return Error(status=400, error_type="KEY_ERROR", message=str(exc))
+
+
+def test_child_overrides_parent_handler():
+    parent = ExceptionsProcessor(BaseErrorHandler)
+    child = parent.create_child(NotFoundErrorHandler)
+
+    assert child.get_error(NotFoundError()).status == 410
+    assert child.get_error(AccessDeniedError()).status == 403
+    assert parent.get_error(NotFoundError()).status == 404
+
+
+def test_child_extends_parent_handlers():
+    parent = ExceptionsProcessor(BaseErrorHandler)
+    child = parent.create_child(KeyErrorHandler)
+
+    assert child.get_error(KeyError("id")).status == 400
+    assert parent.get_error(KeyError("id")).status == 500
+
+
+def test_handler_resolution_is_cached_per_exception_type():
+    processor = ExceptionsProcessor(BaseErrorHandler)
+
+    processor.get_error(NotFoundError())
+    processor.get_error(RuntimeError())
+
+    assert processor._handlers_cache == {NotFoundError: processor.handlers[0], RuntimeError: None}
+
+
+def test_cache_is_reset_when_parent_changes():
+    parent = ExceptionsProcessor(BaseErrorHandler)
+    child = parent.create_child()
+    assert child.get_error(KeyError("id")).status == 500
+
+    parent.add_handlers(KeyErrorHandler)
+
+    assert child.get_error(KeyError("id")).status == 400
+
+
+def test_subclass_is_resolved_by_parent_class_handler():
+    class CustomError(BaseError):
+        code = 418
+
+    processor = ExceptionsProcessor(BaseErrorHandler)
+
+    assert processor.get_error(CustomError()).status == 418
+
+
+def test_cache_is_reset_when_handlers_are_replaced():
+    processor = ExceptionsProcessor(BaseErrorHandler)
+    assert processor.get_error(NotFoundError()).status == 404
+
+    processor.handlers = [NotFoundErrorHandler, *processor.handlers]
+
+    assert processor.get_error(NotFoundError()).status == 410
+
+
+def test_handlers_can_not_be_changed_in_place():
+    processor = ExceptionsProcessor(BaseErrorHandler)
+
+    with pytest.raises(AttributeError):
+        processor.handlers.insert(0, NotFoundErrorHandler())
+
+
+def test_cache_is_reset_when_parent_is_replaced():
+    child = ExceptionsProcessor(parent=ExceptionsProcessor(BaseErrorHandler))
+    assert child.get_error(NotFoundError()).status == 404
+
+    old_parent = child.parent
+    child.parent = ExceptionsProcessor(NotFoundErrorHandler)
+    old_parent.add_handlers(KeyErrorHandler)
+
+    assert child.get_error(NotFoundError()).status == 410
+    assert child.get_error(KeyError("id")).status == 500
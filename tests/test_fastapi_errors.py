@@ -1,13 +1,31 @@
+import json
+
 import pytest
-from fastapi import FastAPI
+from fastapi import APIRouter, Depends, FastAPI
 from fastapi.exceptions import RequestValidationError
 from pydantic.main import BaseModel
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import StreamingResponse
 from starlette.testclient import TestClient
 
-from error_utils.errors import InternalError, AccessDeniedError, ExceptionsProcessor
-from error_utils.framework_helpers.fastapi import FASTAPI_ERROR_HANDLERS, create_error_handling_middleware
+from error_utils.errors import (
+    AccessDeniedError,
+    BaseErrorHandler,
+    Error,
+    ErrorBodyEncoder,
+    ExceptionsProcessor,
+    InternalError,
+    MessageCatalog,
+    StreamFormat,
+)
+from error_utils.errors.types import ErrorType
+from error_utils.framework_helpers.fastapi import (
+    FASTAPI_ERROR_HANDLERS,
+    create_error_handling_middleware,
+    handle_stream_errors,
+    use_exceptions_processor,
+)
 
 
 def success():
@@ -39,15 +57,87 @@ def validation_error(body: Body):
     return body
 
 
+class PublicValidationErrorHandler(BaseErrorHandler):
+    handle_exception = RequestValidationError
+
+    def get_error(self, exception: RequestValidationError) -> Error:
+        return Error(status=422, error_type=ErrorType.VALIDATION_ERROR, message=ErrorType.VALIDATION_ERROR)
+
+
+processor = ExceptionsProcessor(*FASTAPI_ERROR_HANDLERS)
+
+
+async def stream_error():
+
+    async def events():
+        yield b"data: 1\n\n"
+        raise InternalError("Export failed")
+
+    return StreamingResponse(
+        handle_stream_errors(events(), processor, StreamFormat.SSE), media_type=StreamFormat.SSE.media_type
+    )
+
+
+def sync_stream_error():
+
+    def rows():
+        yield b'{"id": 1}\n'
+        raise RuntimeError("Export failed")
+
+    return StreamingResponse(handle_stream_errors(rows(), processor), media_type=StreamFormat.NDJSON.media_type)
+
+
+def partial_stream_error():
+
+    def events():
+        yield "data: 1\n\ndata: "
+        raise InternalError("Export failed")
+
+    return StreamingResponse(
+        handle_stream_errors(events(), processor, StreamFormat.SSE), media_type=StreamFormat.SSE.media_type
+    )
+
+
+public_router = APIRouter(
+    dependencies=[Depends(use_exceptions_processor(processor.create_child(PublicValidationErrorHandler)))]
+)
+public_router.add_api_route("/validation_error", validation_error, methods=["POST"])
+public_router.add_api_route("/access_denied", access_denied_error)
+
+
+class PublicAccessDeniedErrorHandler(BaseErrorHandler):
+    handle_exception = AccessDeniedError
+
+    def get_error(self, exception: AccessDeniedError) -> Error:
+        return Error(status=499, error_type=ErrorType.ACCESS_DENIED, message=ErrorType.ACCESS_DENIED)
+
+
+def auth():
+    raise AccessDeniedError()
+
+
+auth_router = APIRouter(
+    dependencies=[
+        Depends(auth),
+        Depends(use_exceptions_processor(processor.create_child(PublicAccessDeniedErrorHandler))),
+    ]
+)
+auth_router.add_api_route("/", success)
+
+
 app = FastAPI()
-app.add_middleware(BaseHTTPMiddleware,
-                   dispatch=create_error_handling_middleware(ExceptionsProcessor(*FASTAPI_ERROR_HANDLERS)))
+app.add_middleware(BaseHTTPMiddleware, dispatch=create_error_handling_middleware(processor))
 app.router.add_api_route("/", success)
 app.router.add_api_route("/internal_error_500", internal_error_500)
 app.router.add_api_route("/runtime_error", runtime_error)
 app.router.add_api_route("/access_denied", access_denied_error)
 app.router.add_api_route("/division_by_zero", division_by_zero)
 app.router.add_api_route("/validation_error", validation_error, methods=["POST"])
+app.router.add_api_route("/stream_error", stream_error)
+app.router.add_api_route("/sync_stream_error", sync_stream_error)
+app.router.add_api_route("/partial_stream_error", partial_stream_error)
+app.include_router(public_router, prefix="/public")
+app.include_router(auth_router, prefix="/auth")
 
 
 @app.exception_handler(StarletteHTTPException)
@@ -175,3 +265,108 @@ def test_division_by_zero_error(client):
         "message": "division by zero",
         "detail": None,
     }
+
+
+def test_router_validation_error(client):
+    resp = client.post("/public/validation_error", json={"id": "hello"})
+
+    assert resp.status_code == 422
+    assert resp.json() == {
+        "error": "VALIDATION_ERROR",
+        "message": "VALIDATION_ERROR",
+        "detail": None,
+    }
+
+
+def test_router_processor_handles_earlier_dependency_errors(client):
+    resp = client.get("/auth/")
+
+    assert resp.status_code == 499
+    assert resp.json() == {
+        "error": "ACCESS_DENIED",
+        "message": "ACCESS_DENIED",
+        "detail": None,
+    }
+
+
+def test_router_inherits_parent_handlers(client):
+    resp = client.get("/public/access_denied")
+
+    assert resp.status_code == 403
+    assert resp.json() == {
+        "error": "ACCESS_DENIED",
+        "message": "ACCESS_DENIED",
+        "detail": {"login": "Forbidden"},
+    }
+
+
+def test_stream_error(client):
+    resp = client.get("/stream_error")
+
+    assert resp.status_code == 200
+    assert resp.text.split("\n\n")[:2] == [
+        "data: 1",
+        'event: error\ndata: {"error": "INTERNAL_ERROR", "message": "Export failed", "detail": null, "status": 500}',
+    ]
+
+
+def test_sync_stream_error(client):
+    resp = client.get("/sync_stream_error")
+
+    assert resp.status_code == 200
+    assert [json.loads(line) for line in resp.text.splitlines()] == [
+        {"id": 1},
+        {"error": "INTERNAL_ERROR", "message": "Export failed", "detail": None, "status": 500},
+    ]
+
+
+def test_partial_stream_error(client):
+    resp = client.get("/partial_stream_error")
+
+    assert resp.text.split("\n\n") == [
+        "data: 1",
+        "data: ",
+        'event: error\ndata: {"error": "INTERNAL_ERROR", "message": "Export failed", "detail": null, "status": 500}',
+        "",
+    ]
+
+
+def test_compressed_validation_error():
+    compressed_app = FastAPI()
+    compressed_app.add_middleware(
+        BaseHTTPMiddleware,
+        dispatch=create_error_handling_middleware(processor, body_encoder=ErrorBodyEncoder(min_size=100)),
+    )
+    compressed_app.router.add_api_route("/validation_error", validation_error, methods=["POST"])
+    compressed_app.add_exception_handler(RequestValidationError, validation_exception_handler)
+
+    resp = TestClient(compressed_app).post("/validation_error", json={}, headers={"Accept-Encoding": "gzip"})
+
+    assert resp.status_code == 400
+    assert resp.headers["Content-Encoding"] == "gzip"
+    assert resp.json()["error"] == "VALIDATION_ERROR"
+    assert len(resp.json()["detail"]) == 2
+
+
+def test_localized_error():
+    catalog = MessageCatalog()
+    catalog.add_messages("ru", {ErrorType.ACCESS_DENIED: "Доступ запрещен: {login}", ErrorType.NOT_FOUND: "Не найдено"})
+    localized_app = FastAPI()
+    localized_app.add_middleware(
+        BaseHTTPMiddleware, dispatch=create_error_handling_middleware(processor, message_catalog=catalog)
+    )
+    localized_app.router.add_api_route("/access_denied", access_denied_error)
+    localized_app.add_exception_handler(StarletteHTTPException, custom_http_exception_handler)
+    localized_client = TestClient(localized_app)
+
+    resp = localized_client.get("/access_denied", headers={"Accept-Language": "ru-RU,ru;q=0.9"})
+    assert resp.status_code == 403
+    assert resp.json() == {
+        "error": "ACCESS_DENIED",
+        "message": "Доступ запрещен: Forbidden",
+        "detail": {"login": "Forbidden"},
+    }
+
+    resp = localized_client.get("/not_found", headers={"Accept-Language": "ru"})
+    assert resp.status_code == 404
+    assert resp.json() == {"error": "NOT_FOUND", "message": "Не найдено", "detail": None}
@@ -0,0 +1,111 @@
+from error_utils.errors import AccessDeniedError, Error, MessageCatalog, NotFoundError
+from error_utils.errors.handlers import BaseErrorHandler
+from error_utils.errors.headers import parse_accept_header
+from error_utils.errors.types import ErrorType
+
+
+def get_catalog() -> MessageCatalog:
+    catalog = MessageCatalog(default_locale="en")
+    catalog.add_messages("en", {ErrorType.NOT_FOUND: "Not found", ErrorType.ACCESS_DENIED: "Access denied"})
+    catalog.add_messages("ru", {ErrorType.NOT_FOUND: "Не найдено", AccessDeniedError: "Доступ запрещен: {login}"})
+    catalog.compile()
+    return catalog
+
+
+def render(catalog: MessageCatalog, exc: Exception, accept_language: str = None) -> dict:
+    return catalog.render(BaseErrorHandler().get_error(exc), exc, accept_language)
+
+
+def test_parse_accept_header():
+    assert parse_accept_header("en;q=0.5, ru-RU, ru;q=0.9, de;q=0") == ("ru-ru", "ru", "en")
+    assert parse_accept_header(None) == ()
+
+
+def test_get_locale():
+    catalog = get_catalog()
+
+    assert catalog.get_locale("ru-RU,en;q=0.8") == "ru"
+    assert catalog.get_locale("de, en;q=0.5") == "en"
+    assert catalog.get_locale("de") == "en"
+    assert catalog.get_locale(None) == "en"
+
+
+def test_render_localized_message():
+    catalog = get_catalog()
+
+    assert render(catalog, NotFoundError(), "ru") == {"error": "NOT_FOUND", "message": "Не найдено", "detail": None}
+    assert render(catalog, NotFoundError(), "en") == {"error": "NOT_FOUND", "message": "Not found", "detail": None}
+
+
+def test_render_falls_back_to_default_locale():
+    catalog = get_catalog()
+
+    assert render(catalog, AccessDeniedError(), "fr")["message"] == "Access denied"
+
+
+def test_render_formats_template_with_detail():
+    catalog = get_catalog()
+
+    assert render(catalog, AccessDeniedError(detail={"login": "admin"}), "ru") == {
+        "error": "ACCESS_DENIED",
+        "message": "Доступ запрещен: admin",
+        "detail": {"login": "admin"},
+    }
+
+
+def test_render_keeps_explicit_message():
+    catalog = get_catalog()
+
+    assert render(catalog, NotFoundError("Vacancy not found"), "ru")["message"] == "Vacancy not found"
+
+
+def test_render_without_template():
+    catalog = get_catalog()
+    error = Error(status=500, error_type=ErrorType.INTERNAL_ERROR, message=ErrorType.INTERNAL_ERROR)
+
+    assert catalog.render(error, RuntimeError(), "ru")["message"] == "INTERNAL_ERROR"
+
+
+def test_parameterless_body_is_rendered_once():
+    catalog = get_catalog()
+
+    render(catalog, NotFoundError(), "ru")
+    render(catalog, NotFoundError(), "ru-RU")
+
+    assert list(catalog._bodies) == [("ru", NotFoundError, ErrorType.NOT_FOUND)]
+
+
+def test_rendered_body_is_not_shared():
+    catalog = get_catalog()
+
+    render(catalog, NotFoundError(), "ru")["detail"] = "mutated"
+
+    assert render(catalog, NotFoundError(), "ru")["detail"] is None
+
+
+def test_render_with_invalid_template():
+    catalog = MessageCatalog()
+    catalog.add_messages("en", {ErrorType.ACCESS_DENIED: "Access denied for {user.name} {0} {login[0]}"})
+
+    assert render(catalog, AccessDeniedError(detail={"user": "admin"})) == {
+        "error": "ACCESS_DENIED",
+        "message": "Access denied for {user.name} {0} {login[0]}",
+        "detail": {"user": "admin"},
+    }
+
+
+def test_render_localizes_default_http_error_text():
+    catalog = get_catalog()
+    error = Error(status=404, error_type="NOT_FOUND", message="404: Not Found")
+
+    assert catalog.render(error, LookupError(), "ru")["message"] == "Не найдено"
+
+
+def test_render_fallback_message_is_not_memoized():
+    catalog = get_catalog()
+
+    first = catalog.render(Error(status=404, error_type="MISSING", message=None), LookupError(), "ru")
+    second = catalog.render(Error(status=400, error_type="MISSING", message="MISSING"), LookupError(), "ru")
+
+    assert first["message"] is None
+    assert second["message"] == "MISSING"
@@ -0,0 +1,151 @@
+import os
+import time
+
+import pytest
+
+from error_utils.errors import BaseErrorHandler, ErrorSpool, ExceptionsProcessor, NotFoundError, SpoolReader, read_spool
+
+
+def raise_error(exc: Exception) -> Exception:
+    try:
+        raise exc
+    except Exception as ex:
+        return ex
+
+
+def test_unhandled_error_is_spooled(tmp_path):
+    path = str(tmp_path / "errors.log")
+    with ErrorSpool(path) as spool:
+        processor = ExceptionsProcessor(BaseErrorHandler, spool=spool)
+        processor.get_error(raise_error(RuntimeError("Something went wrong")), context={"path": "/"})
+
+    records = list(SpoolReader(path))
+
+    assert len(records) == 1
+    assert records[0]["type"] == "builtins.RuntimeError"
+    assert records[0]["message"] == "Something went wrong"
+    assert records[0]["context"] == {"path": "/"}
+    assert records[0]["stack"][-1].endswith("raise_error")
+    assert len(records[0]["fingerprint"]) == 16
+
+
+def test_handled_error_is_not_spooled(tmp_path):
+    path = str(tmp_path / "errors.log")
+    with ErrorSpool(path) as spool:
+        child = ExceptionsProcessor(BaseErrorHandler, spool=spool).create_child()
+        child.get_error(NotFoundError())
+        child.get_error(ValueError("value"))
+
+    assert [record["type"] for record in SpoolReader(path)] == ["builtins.ValueError"]
+
+
+def wait_for_records(path: str, count: int, timeout: float = 5) -> list:
+    deadline = time.monotonic() + timeout
+    records = list(read_spool(path)) if os.path.exists(path) else []
+    while len(records) < count and time.monotonic() < deadline:
+        time.sleep(0.01)
+        records = list(read_spool(path)) if os.path.exists(path) else []
+    return records
+
+
+def test_records_are_batched(tmp_path):
+    path = str(tmp_path / "errors.log")
+    spool = ErrorSpool(path, batch_size=3, flush_interval=60)
+
+    spool.write(raise_error(RuntimeError("1")))
+    spool.write(raise_error(RuntimeError("2")))
+    time.sleep(0.05)
+    assert not os.path.exists(path)
+
+    spool.write(raise_error(RuntimeError("3")))
+    assert [record["message"] for record in wait_for_records(path, 3)] == ["1", "2", "3"]
+    spool.close()
+
+
+def test_records_are_flushed_periodically(tmp_path):
+    path = str(tmp_path / "errors.log")
+    spool = ErrorSpool(path, batch_size=100, flush_interval=0.05, fsync_interval=0)
+
+    spool.write(raise_error(RuntimeError("1")))
+
+    assert [record["message"] for record in wait_for_records(path, 1)] == ["1"]
+    spool.close()
+
+
+def test_write_after_failed_rotation(tmp_path, monkeypatch):
+    path = str(tmp_path / "errors.log")
+    spool = ErrorSpool(path, max_bytes=1, flush_interval=60)
+    spool.write(raise_error(RuntimeError("1")))
+    spool.flush()
+
+    def fail_replace(source, destination):
+        raise OSError("Disk failure")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(os, "replace", fail_replace)
+        spool.write(raise_error(RuntimeError("2")))
+        spool.flush()
+
+    spool.write(raise_error(RuntimeError("3")))
+    spool.close()
+
+    assert [record["message"] for record in SpoolReader(path)] == ["1", "3"]
+
+
+def test_rotation(tmp_path):
+    path = str(tmp_path / "errors.log")
+    with ErrorSpool(path, max_bytes=1024, backup_count=2, batch_size=1) as spool:
+        for index in range(100):
+            spool.write(raise_error(RuntimeError(str(index))))
+
+    reader = SpoolReader(path)
+    messages = [record["message"] for record in reader]
+
+    assert reader.get_files() == [path + ".2", path + ".1", path]
+    assert all(os.path.getsize(file_name) <= 1024 for file_name in reader.get_files())
+    assert messages == [str(index) for index in range(100 - len(messages), 100)]
+
+
+def test_read_spool_by_fingerprint(tmp_path):
+    path = str(tmp_path / "errors.log")
+    with ErrorSpool(path) as spool:
+        spool.write(raise_error(RuntimeError("1")))
+        spool.write(raise_error(ValueError("2")))
+        spool.write(raise_error(RuntimeError("3")))
+
+    fingerprint = next(iter(spool))["fingerprint"]
+
+    assert [record["message"] for record in read_spool(path, fingerprint=fingerprint)] == ["1", "3"]
+
+
+def test_partially_written_record_is_skipped(tmp_path):
+    path = str(tmp_path / "errors.log")
+    with ErrorSpool(path) as spool:
+        spool.write(raise_error(RuntimeError("1")))
+    with open(path, "ab") as file:
+        file.write(b'{"fingerprint":"')
+
+    assert [record["message"] for record in read_spool(path)] == ["1"]
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+def test_records_are_flushed_in_forked_process(tmp_path):
+    path = str(tmp_path / "errors.log")
+    spool = ErrorSpool(path, batch_size=2, flush_interval=60)
+
+    pid = os.fork()
+    if pid == 0:
+        status = 1
+        try:
+            for index in range(10):
+                spool.write(raise_error(RuntimeError(str(index))))
+            if len(wait_for_records(path, 10)) == 10:
+                status = 0
+        finally:
+            os._exit(status)
+
+    _, status = os.waitpid(pid, 0)
+    spool.close()
+
+    assert os.WIFEXITED(status) and os.WEXITSTATUS(status) == 0
+    assert [record["message"] for record in read_spool(path)] == [str(index) for index in range(10)]
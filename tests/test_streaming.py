@@ -0,0 +1,52 @@
+import json
+
+from error_utils.errors import (
+    AbstractErrorHandler,
+    Error,
+    ExceptionsProcessor,
+    StreamFormat,
+    get_stream_error,
+    render_error_frame,
+)
+from error_utils.errors.types import ErrorType
+
+error = Error(status=500, error_type=ErrorType.INTERNAL_ERROR, message="Export failed")
+
+
+def test_ndjson_error_frame():
+    frame = render_error_frame(error, StreamFormat.NDJSON, b"")
+
+    assert frame.endswith(b"\n")
+    assert json.loads(frame) == {"error": "INTERNAL_ERROR", "message": "Export failed", "detail": None, "status": 500}
+
+
+def test_sse_error_frame():
+    frame = render_error_frame(error, StreamFormat.SSE, b"")
+
+    event, data = frame.decode().rstrip("\n").split("\n")
+    assert event == "event: error"
+    assert json.loads(data[len("data: "):])["message"] == "Export failed"
+    assert frame.endswith(b"\n\n")
+
+
+def test_error_frame_separates_partial_record():
+    assert render_error_frame(error, StreamFormat.NDJSON, b'{"id": 1').startswith(b"\n{")
+    assert render_error_frame(error, StreamFormat.NDJSON, b'{"id": 1}\n').startswith(b"{")
+    assert render_error_frame(error, StreamFormat.NDJSON, b"").startswith(b"{")
+    assert render_error_frame(error, StreamFormat.NDJSON).startswith(b"\n{")
+    assert render_error_frame(error, StreamFormat.SSE, "data: 1").startswith(b"\n\nevent: error")
+    assert render_error_frame(error, StreamFormat.SSE, "data: 1\n").startswith(b"\nevent: error")
+    assert render_error_frame(error, StreamFormat.SSE, "data: 1\n\n").startswith(b"event: error")
+
+
+def test_stream_error_if_handler_fails():
+
+    class FailingHandler(AbstractErrorHandler):
+        handle_exception = KeyError
+
+        def get_error(self, exc: KeyError) -> Error:
+            raise RuntimeError("Handler failed")
+
+    stream_error = get_stream_error(ExceptionsProcessor(FailingHandler), KeyError("id"))
+
+    assert stream_error == Error(status=500, error_type="INTERNAL_ERROR", message="INTERNAL_ERROR")
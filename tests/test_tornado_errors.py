@@ -1,3 +1,4 @@
+import gzip
 from typing import Any
 
 import pytest
@@ -6,9 +7,17 @@ from marshmallow import fields, Schema, ValidationError
 from sqlalchemy.orm.exc import NoResultFound
 from tornado.escape import json_decode, json_encode
 
-from error_utils.errors import AccessDeniedError, BaseErrorHandler, Error, ExceptionsProcessor, InternalError
+from error_utils.errors import (
+    AccessDeniedError,
+    BaseErrorHandler,
+    Error,
+    ErrorBodyEncoder,
+    ExceptionsProcessor,
+    InternalError,
+    MessageCatalog,
+)
 from error_utils.errors.types import ErrorType
-from error_utils.framework_helpers.tornado import TORNADO_ERROR_HANDLERS, handle_error
+from error_utils.framework_helpers.tornado import ErrorHandlingMixin, TORNADO_ERROR_HANDLERS, handle_error
 
 
 class ValidationErrorHandler(BaseErrorHandler):
@@ -76,6 +85,62 @@ class DivizionByZeroView(BaseView):
         self.write(str(result))
 
 
+class PublicValidationErrorHandler(BaseErrorHandler):
+    handle_exception = ValidationError
+
+    def get_error(self, exc: ValidationError) -> Error:
+        return Error(status=422, error_type=ErrorType.VALIDATION_ERROR, message=ErrorType.VALIDATION_ERROR)
+
+
+class PublicView(ErrorHandlingMixin, tornado.web.RequestHandler):
+    exceptions_processor = processor.create_child(PublicValidationErrorHandler)
+
+
+class PublicValidationErrorView(PublicView):
+    async def post(self):
+
+        class RequestSchema(Schema):
+            date = fields.Date(required=True)
+
+        RequestSchema().loads(self.request.body)
+        self.write(json_encode({"test": "ok"}))
+
+
+class PublicAccessDeniedErrorView(PublicView):
+    async def get(self):
+        raise AccessDeniedError()
+
+
+class DefaultProcessorView(ErrorHandlingMixin, tornado.web.RequestHandler):
+    async def get(self):
+        raise AccessDeniedError()
+
+
+catalog = MessageCatalog()
+catalog.add_messages("ru", {ErrorType.ACCESS_DENIED: "Доступ запрещен"})
+
+
+class LocalizedView(ErrorHandlingMixin, tornado.web.RequestHandler):
+    exceptions_processor = processor
+    message_catalog = catalog
+
+    async def get(self):
+        raise AccessDeniedError()
+
+
+class CompressedValidationErrorView(ErrorHandlingMixin, tornado.web.RequestHandler):
+    exceptions_processor = processor
+    body_encoder = ErrorBodyEncoder(min_size=100)
+
+    async def post(self):
+
+        class RequestSchema(Schema):
+            date = fields.Date(required=True)
+
+        RequestSchema().loads(self.request.body)
+        self.write(json_encode({"test": "ok"}))
+
+
 application = tornado.web.Application(
     handlers=[
         (r"/", SuccessView),
@@ -84,6 +149,11 @@ application = tornado.web.Application(
         (r"/validation_error", MarshmallowValidationErrorView),
         (r"/access_denied", AccessDeniedErrorView),
         (r"/divizion_by_zero", DivizionByZeroView),
+        (r"/public/validation_error", PublicValidationErrorView),
+        (r"/public/access_denied", PublicAccessDeniedErrorView),
+        (r"/default_processor", DefaultProcessorView),
+        (r"/localized", LocalizedView),
+        (r"/compressed/validation_error", CompressedValidationErrorView),
     ]
 )
 
@@ -158,3 +228,69 @@ async def test_divizion_by_zero_error(http_server_client):
         "message": "division by zero",
         "detail": None,
     }
+
+
+async def test_handler_validation_error(http_server_client):
+    response = await http_server_client.fetch(
+        "/public/validation_error", method="POST", body='{"wrong": "data"}', raise_error=False
+    )
+
+    assert response.code == 422
+    assert json_decode(response.body) == {
+        "error": "VALIDATION_ERROR",
+        "message": "VALIDATION_ERROR",
+        "detail": None,
+    }
+
+
+async def test_handler_inherits_parent_handlers(http_server_client):
+    response = await http_server_client.fetch("/public/access_denied", raise_error=False)
+
+    assert response.code == 403
+    assert json_decode(response.body) == {
+        "error": "ACCESS_DENIED",
+        "message": "ACCESS_DENIED",
+        "detail": None,
+    }
+
+
+async def test_handler_without_processor(http_server_client):
+    response = await http_server_client.fetch("/default_processor", raise_error=False)
+
+    assert response.code == 403
+    assert json_decode(response.body) == {
+        "error": "ACCESS_DENIED",
+        "message": "ACCESS_DENIED",
+        "detail": None,
+    }
+
+
+async def test_localized_error(http_server_client):
+    response = await http_server_client.fetch(
+        "/localized", headers={"Accept-Language": "ru-RU,ru;q=0.9"}, raise_error=False
+    )
+
+    assert response.code == 403
+    assert json_decode(response.body) == {
+        "error": "ACCESS_DENIED",
+        "message": "Доступ запрещен",
+        "detail": None,
+    }
+
+
+async def test_compressed_validation_error(http_server_client):
+    response = await http_server_client.fetch(
+        "/compressed/validation_error",
+        method="POST",
+        body=json_encode({f"field_{index}": index for index in range(10)}),
+        headers={"Accept-Encoding": "gzip"},
+        decompress_response=False,
+        raise_error=False,
+    )
+
+    assert response.code == 400
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Vary"] == "Accept-Encoding"
+    data = json_decode(gzip.decompress(response.body))
+    assert data["error"] == "VALIDATION_ERROR"
+    assert len(data["detail"]) == 11
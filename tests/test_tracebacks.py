@@ -0,0 +1,115 @@
+import logging
+
+from error_utils.errors import BaseErrorHandler, ErrorSpool, ExceptionsProcessor, SpoolReader, TracebackPolicy
+from error_utils.errors.fingerprints import get_fingerprint
+
+
+def recurse(depth: int):
+    if depth == 0:
+        raise RuntimeError("Too deep")
+    recurse(depth - 1)
+
+
+def raise_chained_error():
+    try:
+        try:
+            raise KeyError("id")
+        except KeyError as ex:
+            raise ValueError("value") from ex
+    except ValueError:
+        raise RuntimeError("runtime")
+
+
+def catch(func, *args) -> Exception:
+    try:
+        func(*args)
+    except Exception as ex:
+        return ex
+
+
+def test_full_traceback_by_default():
+    text = TracebackPolicy().format(catch(raise_chained_error))
+
+    assert "KeyError: 'id'" in text
+    assert "The above exception was the direct cause of the following exception" in text
+    assert "During handling of the above exception, another exception occurred" in text
+    assert text.endswith("RuntimeError: runtime")
+
+
+def test_max_chain():
+    text = TracebackPolicy(max_chain=2).format(catch(raise_chained_error))
+
+    assert "KeyError" not in text
+    assert "ValueError: value" in text
+    assert text.endswith("RuntimeError: runtime")
+
+
+def test_max_depth():
+    exc = catch(recurse, 50)
+
+    frames = TracebackPolicy(max_depth=5).extract(exc.__traceback__)
+
+    assert len(frames) == 5
+    assert frames[-1].line == 'raise RuntimeError("Too deep")'
+
+
+def test_zero_max_depth():
+    exc = catch(recurse, 3)
+
+    assert len(TracebackPolicy(max_depth=0).extract(exc.__traceback__)) == 0
+
+
+def test_exclude_library_frames():
+    exc = catch(recurse, 3)
+    policy = TracebackPolicy(exclude_library_frames=True, library_paths=[__file__])
+
+    assert len(policy.extract(exc.__traceback__)) == 0
+    assert len(TracebackPolicy().extract(exc.__traceback__)) == 5
+
+
+def test_sampling_is_deterministic_with_seed():
+    first = TracebackPolicy(sample_rate=0.5, seed=42)
+    second = TracebackPolicy(sample_rate=0.5, seed=42)
+
+    assert [first.should_capture("a") for _ in range(100)] == [second.should_capture("a") for _ in range(100)]
+    assert first.captured["a"] + first.sampled_out["a"] == 100
+    assert 0 < first.sampled_out["a"] < 100
+
+
+def test_sample_rates_per_fingerprint():
+    policy = TracebackPolicy(sample_rate=1.0, sample_rates={"noisy": 0.0})
+
+    assert policy.capture(catch(recurse, 1), fingerprint="noisy") is None
+    assert policy.capture(catch(recurse, 1), fingerprint="other") is not None
+    assert policy.sampled_out == {"noisy": 1}
+    assert policy.captured == {"other": 1}
+
+
+def test_processor_logs_sampled_out_errors(tmp_path, caplog):
+    exc = catch(recurse, 1)
+    fingerprint = get_fingerprint(exc)
+    path = str(tmp_path / "errors.log")
+    with ErrorSpool(path) as spool:
+        policy = TracebackPolicy(sample_rates={fingerprint: 0.0})
+        processor = ExceptionsProcessor(BaseErrorHandler, spool=spool).create_child()
+        processor.parent.traceback_policy = policy
+
+        with caplog.at_level(logging.ERROR):
+            error = processor.get_error(exc)
+
+    assert error.status == 500
+    assert policy.sampled_out == {fingerprint: 1}
+    assert "traceback is sampled out" in caplog.text
+    assert "Traceback" not in caplog.text
+    assert [(record["fingerprint"], record["sampled"], record["stack"]) for record in SpoolReader(path)] == [
+        (fingerprint, False, None)
+    ]
+
+
+def test_processor_logs_limited_traceback(caplog):
+    processor = ExceptionsProcessor(BaseErrorHandler, traceback_policy=TracebackPolicy(max_depth=2))
+
+    with caplog.at_level(logging.ERROR):
+        processor.get_error(catch(recurse, 50))
+
+    assert caplog.text.count('File "') == 2